@@ -9,12 +9,19 @@ EUR_TO_USD = 1.2
 # data folders to process
 DATA_FOLDERS = ["DATA1", "DATA2", "DATA3"]
 
+# one resolved Path per data folder, built once at import
+DATA_DIRS = {name: BASE_DIR / 'data' / name for name in DATA_FOLDERS}
+
 # output paths
 OUTPUT_DIR = 'output'
 CHARTS_DIR = 'output/charts'
 RESULTS_DIR = 'output/results'
 DASHBOARD_DIR = 'dashboard'
 
-NULL_VALUES = ['NULL', 'None', '', ' ', '\t', None]
+# null markers in the raw data (a set, so membership checks are O(1))
+NULL_VALUES = frozenset(['NULL', 'None', '', ' ', '\t', None])
+
+# NULL_VALUES as they look after .strip(), for checks on already stripped strings
+NULL_STRIPPED = frozenset(v.strip() for v in NULL_VALUES if isinstance(v, str))
 
 DATE_FORMAT = '%Y-%m-%d'
\ No newline at end of file
@@ -8,11 +8,12 @@ and generates the results and charts.
 import sys
 import json
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
 PROJECT_ROOT = Path(__file__).resolve().parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from config.settings import BASE_DIR, DATA_FOLDERS, CHARTS_DIR, RESULTS_DIR
+from config.settings import DATA_FOLDERS, DATA_DIRS, CHARTS_DIR, RESULTS_DIR
 from src.extract import load_all_data
 from src.transform import transform_all
 from src.analyze import run_analysis
@@ -37,7 +38,7 @@ def run_pipeline(data_folder: Path, dataset_name: str) -> dict:
     # EXTRACT: Load raw data from files
     print("\n  [1/4] EXTRACT - Loading data from files...")
     
-    users_raw, orders_raw, books_raw = load_all_data(str(data_folder))
+    users_raw, orders_raw, books_raw = load_all_data(data_folder)
     
     print(f"Loaded {len(users_raw):,} users")
     print(f"Loaded {len(orders_raw):,} orders")
@@ -117,19 +118,29 @@ def main():
     
     all_results = {}
     
-    # process each dataset
+    # collect the datasets that exist
+    datasets = []
     for dataset_name in DATA_FOLDERS:
-        # build path to data folder
-        data_folder = BASE_DIR / 'data' / dataset_name
+        # path to data folder
+        data_folder = DATA_DIRS[dataset_name]
         
         # check if folder exists
         if not data_folder.exists():
             print(f"\n     WARNING: {data_folder} not found, skipping...")
             continue
         
-        # run the pipeline
-        results = run_pipeline(data_folder, dataset_name)
-        
+        datasets.append((data_folder, dataset_name))
+    
+    # run the pipeline for each dataset in its own process (they are independent and CPU bound)
+    # only the small results dict travels back to this process
+    with ProcessPoolExecutor(max_workers=max(len(datasets), 1)) as executor:
+        pipeline_results = list(executor.map(
+            run_pipeline,
+            [data_folder for data_folder, _ in datasets],
+            [dataset_name for _, dataset_name in datasets],
+        ))
+    
+    for (_, dataset_name), results in zip(datasets, pipeline_results):
         # save results to JSON
         results_dir = PROJECT_ROOT / RESULTS_DIR
         saved_path = save_results(results, results_dir, dataset_name)
@@ -26,7 +26,7 @@ def calculate_daily_revenue(orders_df: pd.DataFrame) -> pd.DataFrame:
         orders_df: Transformed orders DataFrame (must have 'date' and 'paid_price' columns)
     
     Returns:
-        DataFrame with columns: date, revenue (sorted by date)
+        DataFrame with columns: date ('YYYY-MM-DD' string), revenue (sorted by date)
     """
     # group by date and sum the paid_price
     daily = orders_df.groupby('date')['paid_price'].sum().reset_index()
@@ -37,6 +37,9 @@ def calculate_daily_revenue(orders_df: pd.DataFrame) -> pd.DataFrame:
     # sort by date (asc order)
     daily = daily.sort_values('date')
     
+    # format dates as strings only once per day, not once per order
+    daily['date'] = daily['date'].dt.strftime('%Y-%m-%d')
+    
     # round revenue to 2 decimal places
     daily['revenue'] = daily['revenue'].round(2)
     
@@ -249,7 +252,8 @@ def deduplicate_users(users_df: pd.DataFrame) -> Tuple[int, Dict[int, List[int]]
             v1 = d1.get(field)
             v2 = d2.get(field)
             
-            if v1 and v2:
+            # arrow-backed columns hold pd.NA for missing values, which can't be used as a bool
+            if pd.notna(v1) and pd.notna(v2) and v1 and v2:
                 if v1 == v2:
                     matches += 1
         
@@ -1,46 +1,56 @@
 import pandas as pd
 import yaml
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union
+
+# use libyaml's C parser when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 
 # convert users dataset into df
-def load_users(data_folder: str) -> pd.DataFrame:
+def load_users(data_folder: Union[str, Path]) -> pd.DataFrame:
     filepath = Path(data_folder) / 'users.csv'
-    df = pd.read_csv(filepath)
+    df = pd.read_csv(filepath, dtype_backend='pyarrow')
     return df
 
 
+# orders columns used by the transform/analyze steps, the rest are never read from disk
+ORDER_COLUMNS = ['user_id', 'book_id', 'quantity', 'unit_price', 'timestamp', 'shipping']
+
+
 # convert orders dataset into df
-def load_orders(data_folder: str) -> pd.DataFrame:
+def load_orders(data_folder: Union[str, Path]) -> pd.DataFrame:
     filepath = Path(data_folder) / 'orders.parquet'
-    df = pd.read_parquet(filepath)
+    df = pd.read_parquet(filepath, engine='pyarrow', columns=ORDER_COLUMNS, dtype_backend='pyarrow')
     return df
 
 
 # convert books dataset into df
-def load_books(data_folder: str) -> pd.DataFrame:
+def load_books(data_folder: Union[str, Path]) -> pd.DataFrame:
     filepath = Path(data_folder) / 'books.yaml'
     
     with open(filepath, 'r', encoding='utf-8') as f:
-        books_data = yaml.safe_load(f)
+        books_data = yaml.load(f, Loader=_YamlLoader)
     
-    cleaned_books = []
-    for book in books_data:
-        cleaned_book = {}
-        for key, value in book.items():
-            # remove leading colon :
-            clean_key = key.lstrip(':') if isinstance(key, str) else key
-            cleaned_book[clean_key] = value
-        cleaned_books.append(cleaned_book)
+    df = pd.DataFrame(books_data)
     
-    df = pd.DataFrame(cleaned_books)
+    # remove leading colon :
+    df.columns = [col.lstrip(':') if isinstance(col, str) else col for col in df.columns]
     return df
 
 
 # load all data -> returns tuple of dfs (users_df, orders_df, books_df)
-def load_all_data(data_folder: str) -> tuple:
-    users = load_users(data_folder)
-    orders = load_orders(data_folder)
-    books = load_books(data_folder)
+# the three files are read in parallel threads, the readers release the GIL while doing I/O
+def load_all_data(data_folder: Union[str, Path]) -> tuple:
+    data_folder = Path(data_folder)
     
-    return users, orders, books
\ No newline at end of file
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        users = executor.submit(load_users, data_folder)
+        orders = executor.submit(load_orders, data_folder)
+        books = executor.submit(load_books, data_folder)
+        
+        return users.result(), orders.result(), books.result()
\ No newline at end of file
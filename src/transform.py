@@ -1,13 +1,45 @@
 import pandas as pd
-import numpy as np
 import re
 from dateutil import parser as date_parser
-from typing import Optional
+from typing import Callable, Optional
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from config.settings import EUR_TO_USD, NULL_VALUES
+from config.settings import EUR_TO_USD, NULL_VALUES, NULL_STRIPPED
+
+# regex patterns are compiled once at import instead of on every row
+# flags are inline so the column functions can hand .pattern to arrow, a compiled pattern makes .str fall back to python
+_PRICE_EURO_RE = re.compile(r'(?i)[€]|EUR')
+_PRICE_CURRENCY_RE = re.compile(r'(?i)[€$]|EUR|USD')
+_PRICE_CENT_RE = re.compile(r'(\d+)\s*¢\s*(\d+)')
+_PRICE_STRIP_RE = re.compile(r'[^\d.]')
+
+_TS_SEMI_RE = re.compile(r';')
+_TS_COMMA_RE = re.compile(r',\s*')
+_TS_AMPM_DOT_RE = re.compile(r'(?i)([AP])\.M\.')
+_TS_AM_RE = re.compile(r'(?i)\s+am\b')
+_TS_PM_RE = re.compile(r'(?i)\s+pm\b')
+_TS_T_RE = re.compile(r'T')
+# a UTC offset or zone name (Z/UTC/GMT/EST...) ending the string, either right after the time
+# or as its own word after anything else that follows the time (AM/PM, the year, ...)
+_TS_OFFSET_PATTERN = r'\d:\d{2}(?:(?::\d{2})?(?:\.\d+)?\s*|.*\s)(?:(?i:Z|UTC|GMT)|[A-Z]{3}|[+-]\d{2}:?\d{2})$'
+
+# arrow's RE2 treats \d as ASCII only, \p{Nd} keeps every unicode digit like python's [^\d] did
+_NON_DIGIT_PATTERN = r'[^\p{Nd}]+'
+_PERIOD_PATTERN = r'\s*\.\s*'
+_WS_PATTERN = r'\s+'
+
+# arrow-backed string dtype used for all text columns, its .str methods run on arrow buffers
+STRING_DTYPE = pd.StringDtype('pyarrow')
+
+# stripped null markers plus the string 'nan' left behind by str() on float NaN
+_NULL_STRINGS = NULL_STRIPPED | {'nan', 'NaN'}
+
+# common titles and suffixes stripped from names, each as one alternation so a name is scanned once per list
+_TITLES_PATTERN = r'(?i)\b(?:mr|mrs|ms|miss|dr|prof|rev|fr|msgr|gov|rep|sen|amb|the\s+hon)\.?\b'
+# suffixes (these come after the name) need whitespace before them, so names like 'do kim' or 'v smith' keep their first word
+_SUFFIXES_PATTERN = r'(?i)\s(?:esq|jr|sr|i+|iv|v|phd|md|dds|do|dvm|cpa|lld|dc|vm|ret)\.?\b'
 
 # normalize the prices
 def parse_price(price_str: str) -> Optional[float]:
@@ -15,31 +47,33 @@ def parse_price(price_str: str) -> Optional[float]:
         return None
     
     price_str = str(price_str).strip()
+    if price_str in NULL_STRIPPED:
+        return None
     
     # is it euro or usd 
-    is_euro = bool(re.search(r'[€]|EUR', price_str, re.IGNORECASE))
+    is_euro = bool(_PRICE_EURO_RE.search(price_str))
     
     # remove currency symbols and text
-    cleaned = re.sub(r'[€$]|EUR|USD', '', price_str, flags=re.IGNORECASE).strip()
+    cleaned = _PRICE_CURRENCY_RE.sub('', price_str).strip()
     
     # handle special cent notation
-    cent_match = re.search(r'(\d+)\s*¢\s*(\d+)', cleaned)
+    cent_match = _PRICE_CENT_RE.search(cleaned)
     if cent_match:
         dollars = cent_match.group(1)
         cents = cent_match.group(2)
         value = float(f"{dollars}.{cents}")
     else:
         # remove cent symbol and any remaining non-numeric chars except decimal point
-        cleaned = re.sub(r'¢', '', cleaned)
-        cleaned = re.sub(r'[^\d.]', '', cleaned)
+        cleaned = _PRICE_STRIP_RE.sub('', cleaned)
         
         if not cleaned or cleaned == '.':
             return None
         
         # handle multiple decimal points case (not sure if it exists in dataset)
-        if cleaned.count('.') > 1:
-            parts = cleaned.split('.')
-            cleaned = parts[0] + '.' + ''.join(parts[1:])
+        # keep the first decimal point and drop the rest in a single pass
+        first_dot = cleaned.find('.')
+        if first_dot >= 0:
+            cleaned = cleaned[:first_dot + 1] + cleaned[first_dot + 1:].replace('.', '')
         
         try:
             value = float(cleaned)
@@ -52,25 +86,73 @@ def parse_price(price_str: str) -> Optional[float]:
     
     return round(value, 2)
 
+# round to cents exactly like python's round(value, 2) does, without a python call per value
+# values * 100 is itself rounded, so a product landing on .5 is settled by its exact rounding error
+# (Dekker's split of the value into two halves whose products with 100 are exact)
+def round_cents(values: pd.Series) -> pd.Series:
+    scaled = values * 100
+    high = values * 134217729.0
+    high = high - (high - values)
+    error = (high * 100 - scaled) + (values - high) * 100
+    
+    floor = scaled // 1
+    tie = (scaled - floor) == 0.5
+    cents = scaled.round().mask(tie & (error > 0), floor + 1).mask(tie & (error < 0), floor)
+    return cents / 100
+
+# vectorized version of parse_price, runs over the whole price column at once
+def parse_price_column(prices: pd.Series) -> pd.Series:
+    s = prices.astype(STRING_DTYPE).str.strip()
+    
+    # is it euro or usd
+    is_euro = s.str.contains(_PRICE_EURO_RE.pattern, na=False)
+    
+    # remove currency symbols and text
+    cleaned = s.str.replace(_PRICE_CURRENCY_RE.pattern, '', regex=True).str.strip()
+    
+    # handle special cent notation, extract has no arrow kernel so only run it on rows with a cent sign
+    has_cents = cleaned.str.contains('¢', regex=False, na=False)
+    cents = cleaned[has_cents].str.extract(_PRICE_CENT_RE.pattern)
+    cent_prices = (cents[0] + '.' + cents[1]).reindex(cleaned.index)
+    
+    # remove cent symbol and any remaining non-numeric chars except decimal point
+    digits = cleaned.str.replace(_PRICE_STRIP_RE.pattern, '', regex=True)
+    
+    # handle multiple decimal points case, only touches the few rows that have it
+    multi_dot = digits.str.count(r'\.').fillna(0) > 1
+    if multi_dot.any():
+        parts = digits[multi_dot].str.partition('.')
+        digits[multi_dot] = parts[0] + parts[1] + parts[2].str.replace('.', '', regex=False)
+    
+    digits = digits.mask(cent_prices.notna(), cent_prices)
+    values = pd.to_numeric(digits, errors='coerce').astype('float64')
+    
+    # convert euro to usd
+    values = values.mask(is_euro, values * EUR_TO_USD)
+    
+    # Series.round scales by 100 and would land a cent off round() on half-cent inputs (45.945 -> 45.94)
+    return round_cents(values)
+
 # normalize timestamp values to proper datetimes
 def parse_timestamp(ts_str: str) -> Optional[pd.Timestamp]:
     if pd.isna(ts_str) or ts_str in NULL_VALUES:
         return None
     
     ts_str = str(ts_str).strip()
+    if ts_str in NULL_STRIPPED:
+        return None
     
     # clean up common separator issues
-    ts_str = re.sub(r';', ' ', ts_str)  # replace semicolons with spaces
-    ts_str = re.sub(r',\s*', ' ', ts_str)  # remove commas
+    ts_str = _TS_SEMI_RE.sub(' ', ts_str)  # replace semicolons with spaces
+    ts_str = _TS_COMMA_RE.sub(' ', ts_str)  # remove commas
     
     # normalize AM/PM variations
-    ts_str = re.sub(r'A\.M\.', 'AM', ts_str, flags=re.IGNORECASE)
-    ts_str = re.sub(r'P\.M\.', 'PM', ts_str, flags=re.IGNORECASE)
-    ts_str = re.sub(r'\s+am\b', ' AM', ts_str, flags=re.IGNORECASE)
-    ts_str = re.sub(r'\s+pm\b', ' PM', ts_str, flags=re.IGNORECASE)
+    ts_str = _TS_AMPM_DOT_RE.sub(r'\1M', ts_str)
+    ts_str = _TS_AM_RE.sub(' AM', ts_str)
+    ts_str = _TS_PM_RE.sub(' PM', ts_str)
     
     # handle ISO format T separator
-    ts_str = re.sub(r'T', ' ', ts_str)
+    ts_str = _TS_T_RE.sub(' ', ts_str)
     
     try:
         parsed = date_parser.parse(ts_str, fuzzy=True, dayfirst=False)
@@ -84,74 +166,91 @@ def parse_timestamp(ts_str: str) -> Optional[pd.Timestamp]:
             return None
 
 
-# replace possible null representations with proper NaN
-def clean_null_values(df: pd.DataFrame, columns: list = None) -> pd.DataFrame:
-    df = df.copy()
-    columns = columns or df.columns
+# parse_timestamp keeps any UTC offset, drop it so the date stays the local wall-clock date
+def parse_naive_timestamp(ts_str: str) -> Optional[pd.Timestamp]:
+    parsed = parse_timestamp(ts_str)
+    if parsed is not None and parsed.tzinfo is not None:
+        parsed = parsed.tz_localize(None)
+    return parsed
+
+# make sure a parsed column is naive datetime64[ns], whatever mix of tz-aware values it came back with
+def to_naive_datetimes(parsed: pd.Series) -> pd.Series:
+    if isinstance(parsed.dtype, pd.DatetimeTZDtype):
+        return parsed.dt.tz_localize(None).astype('datetime64[ns]')
+    if parsed.dtype != 'datetime64[ns]':
+        parsed = parsed.map(
+            lambda x: x.replace(tzinfo=None) if pd.notna(x) and getattr(x, 'tzinfo', None) is not None else x
+        )
+    return pd.to_datetime(parsed).astype('datetime64[ns]')
+
+# vectorized version of parse_timestamp, runs over the whole timestamp column at once
+def parse_timestamp_column(timestamps: pd.Series) -> pd.Series:
+    ts = timestamps.astype(STRING_DTYPE).str.strip()
+    ts = ts.where(~ts.isin(_NULL_STRINGS))
     
-    for col in columns:
-        if col in df.columns:
-            df[col] = df[col].replace(NULL_VALUES, np.nan)
-            # also handle string 'nan' and whitespace-only strings
-            if df[col].dtype == object:
-                df[col] = df[col].apply(
-                    lambda x: np.nan if (isinstance(x, str) and x.strip() in ['', 'nan', 'NaN', 'NULL', 'None']) else x
-                )
+    # pd.to_datetime can't mix tz-aware and naive values, rows with a UTC offset or zone go to the scalar parser below
+    # (checked before the cleanup, the T replace below would break zone names like UTC or EST)
+    has_offset = ts.str.contains(_TS_OFFSET_PATTERN, na=False)
+    naive = ts.notna() & ~has_offset
     
-    return df
-
-# normalize name by removing titles/suffixes and converting to lowercase
-def normalize_name(name: str) -> Optional[str]:
-    if pd.isna(name):
-        return None
+    # clean up common separator issues
+    ts = ts.str.replace(';', ' ', regex=False)
+    ts = ts.str.replace(_TS_COMMA_RE.pattern, ' ', regex=True)
     
-    name = str(name).strip().lower()
-    
-    # remove common titles and suffixes
-    titles = [
-        r'\bmr\.?\s*',
-        r'\bmrs\.?\s*',
-        r'\bms\.?\s*',
-        r'\bmiss\.?\s*',
-        r'\bdr\.?\s*',
-        r'\bprof\.?\s*',
-        r'\brev\.?\s*',
-        r'\bfr\.?\s*',
-        r'\bmsgr\.?\s*',
-        r'\bgov\.?\s*',
-        r'\brep\.?\s*',
-        r'\bsen\.?\s*',
-        r'\bamb\.?\s*',
-        r'\bthe\s+hon\.?\s*',
-        # suffixes (these come after the name)
-        r'\s+esq\.?\s*',
-        r'\s+jr\.?\s*',
-        r'\s+sr\.?\s*',
-        r'\s+i+\s*',
-        r'\s+ii+\s*',
-        r'\s+iii+\s*',
-        r'\s+iv\s*',
-        r'\s+v\s*',
-        r'\s+phd\.?\s*',
-        r'\s+md\.?\s*',
-        r'\s+dds\.?\s*',
-        r'\s+do\.?\s*',
-        r'\s+dvm\.?\s*',
-        r'\s+cpa\.?\s*',
-        r'\s+lld\.?\s*',
-        r'\s+dc\.?\s*',
-        r'\s+vm\.?\s*',
-        r'\s+ret\.?\s*',
-    ]
+    # normalize AM/PM variations, a backreference in the replacement would make arrow fall back to python
+    ts = ts.str.replace(r'(?i)A\.M\.', 'AM', regex=True)
+    ts = ts.str.replace(r'(?i)P\.M\.', 'PM', regex=True)
+    ts = ts.str.replace(_TS_AM_RE.pattern, ' AM', regex=True)
+    ts = ts.str.replace(_TS_PM_RE.pattern, ' PM', regex=True)
+    
+    # handle ISO format T separator
+    ts = ts.str.replace('T', ' ', regex=False)
+    
+    parsed = pd.Series(pd.NaT, index=ts.index, dtype='datetime64[ns]')
+    if naive.any():
+        parsed[naive] = to_naive_datetimes(pd.to_datetime(ts[naive], errors='coerce', format='mixed', dayfirst=False))
+    
+    # try with day-first interpretation
+    missing = naive & parsed.isna()
+    if missing.any():
+        parsed[missing] = to_naive_datetimes(pd.to_datetime(ts[missing], errors='coerce', format='mixed', dayfirst=True))
+    
+    # whatever is left needs the fuzzy scalar parser (e.g. leading weekday names, UTC offsets)
+    missing = ts.notna() & parsed.isna()
+    if missing.any():
+        parsed[missing] = to_naive_datetimes(timestamps[missing].map(parse_naive_timestamp))
     
-    for title in titles:
-        name = re.sub(title, ' ', name, flags=re.IGNORECASE)
+    return parsed
+
+# raw order values repeat a lot, so parse each distinct value once and map the results back onto the rows
+def parse_unique(values: pd.Series, parse_column: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    codes, uniques = pd.factorize(values)
+    parsed = parse_column(pd.Series(uniques))
+    
+    # missing values have code -1, which reindex turns into NaN/NaT
+    result = parsed.reindex(codes)
+    result.index = values.index
+    return result
+
+# strip a text column and turn null markers into NA in the same pass
+# transforms feed the result straight into their normalizations instead of cleaning and stripping separately
+def strip_null_values(values: pd.Series) -> pd.Series:
+    stripped = values.astype(STRING_DTYPE).str.strip()
+    return stripped.where(~stripped.isin(_NULL_STRINGS))
+
+# replace possible null representations with proper NaN (modifies df in place and returns it)
+def clean_null_values(df: pd.DataFrame, columns: list = None) -> pd.DataFrame:
+    columns = columns or df.columns
     
-    # clean up extra spaces and any remaining standalone periods
-    name = re.sub(r'\s*\.\s*', ' ', name)  # remove standalone periods
-    name = re.sub(r'\s+', ' ', name).strip()
+    for col in columns:
+        if col in df.columns and pd.api.types.is_string_dtype(df[col].dtype):
+            s = df[col]
+            # arrow text columns come out as arrow-backed strings, mixed object columns (e.g. year) stay object
+            if s.dtype != object:
+                s = s.astype(STRING_DTYPE)
+            df[col] = s.where(strip_null_values(s).notna())
     
-    return name if name else None
+    return df
 
 
 def transform_users(users_df: pd.DataFrame) -> pd.DataFrame:
@@ -159,27 +258,33 @@ def transform_users(users_df: pd.DataFrame) -> pd.DataFrame:
     Clean and transform users data.
     
     Creates normalized versions of fields for deduplication comparison.
+    Modifies users_df in place, pass a copy if the raw frame is still needed.
     """
-    df = users_df.copy()
+    df = users_df
     
-    # clean null values
-    df = clean_null_values(df, ['name', 'address', 'phone', 'email'])
+    # clean null values, the columns come back stripped so the normalizations below don't strip again
+    for col in ['name', 'address', 'phone', 'email']:
+        df[col] = strip_null_values(df[col])
     
     # normalize phone: keep only digits for comparison
-    df['phone_normalized'] = df['phone'].apply(
-        lambda x: re.sub(r'[^\d]', '', str(x)) if pd.notna(x) else None
-    )
+    df['phone_normalized'] = df['phone'].str.replace(_NON_DIGIT_PATTERN, '', regex=True)
     
     # normalize email: lowercase
-    df['email_normalized'] = df['email'].str.lower().str.strip()
+    df['email_normalized'] = df['email'].str.lower()
+    
+    # email domain has few distinct values, store it as category codes
+    df['email_domain'] = df['email_normalized'].str.replace(r'^.*@', '', regex=True).astype('category')
     
     # normalize name: lowercase, remove titles
-    df['name_normalized'] = df['name'].apply(normalize_name)
+    names = df['name'].str.lower()
+    names = names.str.replace(_TITLES_PATTERN, ' ', regex=True)
+    names = names.str.replace(_SUFFIXES_PATTERN, ' ', regex=True)
+    names = names.str.replace(_PERIOD_PATTERN, ' ', regex=True)
+    names = names.str.replace(_WS_PATTERN, ' ', regex=True).str.strip()
+    df['name_normalized'] = names.mask(names == '')
     
     # normalize address: lowercase, simplified
-    df['address_normalized'] = df['address'].apply(
-        lambda x: re.sub(r'\s+', ' ', str(x).lower().strip()) if pd.notna(x) else None
-    )
+    df['address_normalized'] = df['address'].str.lower().str.replace(_WS_PATTERN, ' ', regex=True)
     
     return df
 
@@ -190,66 +295,62 @@ def transform_orders(orders_df: pd.DataFrame) -> pd.DataFrame:
     
     - Parse messy prices to USD
     - Parse messy timestamps
-    - Extract date (YYYY-MM-DD)
+    - Extract date (datetime64 truncated to the day)
     - Calculate paid_price = quantity * unit_price
+    
+    Modifies orders_df in place, pass a copy if the raw frame is still needed.
     """
-    df = orders_df.copy()
+    df = orders_df
     
     # clean null values
-    df = clean_null_values(df, ['unit_price', 'timestamp', 'shipping'])
+    # unit_price and timestamp are left raw, their parsers already treat every null marker as missing
+    df = clean_null_values(df, ['shipping'])
     
     # normalize prices
-    df['unit_price_usd'] = df['unit_price'].apply(parse_price)
+    df['unit_price_usd'] = parse_unique(df['unit_price'], parse_price_column)
     
     # normalize timestamps
-    df['parsed_timestamp'] = df['timestamp'].apply(parse_timestamp)
+    df['parsed_timestamp'] = parse_unique(df['timestamp'], parse_timestamp_column)
     
-    # extract date (year, month, day only)
-    df['date'] = df['parsed_timestamp'].apply(
-        lambda x: x.strftime('%Y-%m-%d') if pd.notna(x) else None
-    )
+    # extract date (year, month, day only), kept as datetime64 so no per-row strings are built
+    df['date'] = df['parsed_timestamp'].dt.floor('D')
     
     # calculate paid_price
-    df['paid_price'] = df['quantity'] * df['unit_price_usd']
+    # quantity is arrow-backed, cast it so paid_price stays a plain float64 column like unit_price_usd
+    df['paid_price'] = df['quantity'].astype('float64') * df['unit_price_usd']
     
     # Remove rows with invalid essential data
     df = df.dropna(subset=['unit_price_usd', 'date', 'user_id', 'book_id'])
     
     return df
 
-# create frozenset of author sets, (we use it later as a dictionary key)
-def create_author_set(author_str: str) -> Optional[frozenset]:
-    if pd.isna(author_str):
-        return None
-    
-    # split by comma
-    authors = [a.strip().lower() for a in str(author_str).split(',')]
-    
-    # remove empty strings
-    authors = [a for a in authors if a]
-    
-    if not authors:
-        return None
-    
-    return frozenset(authors)
-
 
-# clean and transform books data
+# clean and transform books data (modifies books_df in place)
 def transform_books(books_df: pd.DataFrame) -> pd.DataFrame:
-    df = books_df.copy()
+    df = books_df
     
     # clean null values
     df = clean_null_values(df, ['title', 'author', 'genre', 'publisher', 'year'])
     
-    # ensure id is integer
-    df['id'] = pd.to_numeric(df['id'], errors='coerce').astype('Int64')
+    # low-cardinality text columns are stored as category codes
+    for col in ['genre', 'publisher']:
+        df[col] = df[col].astype('category')
     
-    # create normalized author sets for comparison
-    df['author_set'] = df['author'].apply(create_author_set)
+    # ensure id is integer
+    df['id'] = pd.to_numeric(df['id'], errors='coerce').astype('int64[pyarrow]')
+    
+    # create normalized author sets for comparison (frozensets, we use them later as dictionary keys)
+    # splitting and lowercasing run as .str operations, only the frozenset is built in python
+    authors = df['author'].astype(STRING_DTYPE).str.lower().str.split(',')
+    df['author_set'] = [
+        (frozenset(a for a in (name.strip() for name in names) if a) or None) if isinstance(names, list) else None
+        for names in authors
+    ]
     
     return df
 
 # wrap everything up and deliver -> tuple: (transformed_users, transformed_orders, transformed_books)
+# the raw frames are transformed in place, so callers should not reuse them afterwards
 def transform_all(users_df: pd.DataFrame, orders_df: pd.DataFrame, books_df: pd.DataFrame) -> tuple:
     users = transform_users(users_df)
     orders = transform_orders(orders_df)
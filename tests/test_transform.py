@@ -0,0 +1,102 @@
+import sys
+import unittest
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.transform import parse_price, parse_price_column, parse_timestamp_column, round_cents, transform_users
+
+
+class ParseTimestampColumnTest(unittest.TestCase):
+    # tz-aware strings mixed with naive ones keep their local wall-clock date, as the per-row parser did
+    def test_mixed_tz_aware_and_naive(self):
+        timestamps = pd.Series([
+            '2021-03-04T10:00:00+02:00',
+            '2021-03-05T23:30:00Z',
+            '2021-03-06 10:00:00',
+            'Thu Mar 28 13:47:42 2024 +0500',
+            None,
+        ])
+        
+        parsed = parse_timestamp_column(timestamps)
+        
+        self.assertEqual(parsed.dtype, 'datetime64[ns]')
+        self.assertEqual(
+            parsed.dt.strftime('%Y-%m-%d').tolist()[:4],
+            ['2021-03-04', '2021-03-05', '2021-03-06', '2024-03-28'],
+        )
+        self.assertTrue(pd.isna(parsed.iloc[4]))
+    
+    # offsets that don't follow the time directly must still skip pd.to_datetime,
+    # mixing zones there is deprecated in pandas (FutureWarning) and only worked through an object column
+    def test_mixed_offsets_after_am_pm_and_year(self):
+        timestamps = pd.Series([
+            '2021-03-04 10:00 AM +02:00',
+            'Thu Mar 28 13:47:42 2024 +0500',
+            '2021-03-04 10:00:00 -0700',
+            '2021-03-06 10:00:00',
+        ])
+        
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', FutureWarning)
+            parsed = parse_timestamp_column(timestamps)
+        
+        self.assertEqual(parsed.dtype, 'datetime64[ns]')
+        self.assertEqual(parsed.tolist(), [
+            pd.Timestamp('2021-03-04 10:00:00'),
+            pd.Timestamp('2024-03-28 13:47:42'),
+            pd.Timestamp('2021-03-04 10:00:00'),
+            pd.Timestamp('2021-03-06 10:00:00'),
+        ])
+    
+    def test_only_tz_aware(self):
+        parsed = parse_timestamp_column(pd.Series(['2021-03-04T10:00:00+02:00', '2021-03-04T10:00:00-05:00']))
+        
+        self.assertEqual(parsed.dtype, 'datetime64[ns]')
+        self.assertEqual(parsed.tolist(), [pd.Timestamp('2021-03-04 10:00:00')] * 2)
+
+
+class ParsePriceColumnTest(unittest.TestCase):
+    # rounding has to agree with the scalar parser, including half-cent inputs
+    def test_matches_parse_price(self):
+        prices = pd.Series(['45.945', '1x.1USD45', '€12.50', '$3.99', '4¢99', '1.2.3', 'N/A', None, ''])
+        
+        parsed = parse_price_column(prices)
+        
+        self.assertEqual(parsed.dtype, 'float64')
+        self.assertEqual(parsed.iloc[0], 45.95)
+        self.assertEqual(parsed.iloc[1], 1.15)
+        for raw, value in zip(prices, parsed):
+            expected = parse_price(raw)
+            if expected is None:
+                self.assertTrue(pd.isna(value), raw)
+            else:
+                self.assertEqual(value, expected, raw)
+
+    
+    # exact binary ties round half to even, near-ties go by the value that is actually stored
+    def test_round_cents_matches_round(self):
+        values = [45.945, 2.675, 1.005, 0.125, 0.375, 12.5 * 1.08, 1e-9, 123456.785]
+        
+        rounded = round_cents(pd.Series(values + [None], dtype='float64'))
+        
+        self.assertEqual(rounded.tolist()[:-1], [round(v, 2) for v in values])
+        self.assertTrue(pd.isna(rounded.iloc[-1]))
+
+
+
+class TransformUsersTest(unittest.TestCase):
+    # suffixes only count after another word, a first name that looks like one stays
+    def test_name_titles_and_suffixes(self):
+        names = ['Do Kim', 'Md Rahman', 'V Smith', 'Dr. John Smith Jr.', 'Kim Do', 'Mrs. Jane Doe PhD', 'Ann Lee III']
+        users = pd.DataFrame({'name': names, 'address': 'a', 'phone': '1', 'email': 'a@b.c'})
+        
+        normalized = transform_users(users)['name_normalized'].tolist()
+        
+        self.assertEqual(normalized, ['do kim', 'md rahman', 'v smith', 'john smith', 'kim', 'jane doe', 'ann lee'])
+
+
+if __name__ == '__main__':
+    unittest.main()